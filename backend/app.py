@@ -4,34 +4,59 @@ import json
 import os
 import re
 import shlex
+import shutil
+import sys
 import tempfile
-import secrets
+import time
 import tomllib
 import hashlib
 from contextlib import contextmanager
-from dataclasses import dataclass
-from datetime import datetime
+from functools import lru_cache
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
 from pathlib import PureWindowsPath
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 import traceback
 
 from aiohttp import web
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is the fallback.
+    orjson = None
+
 WS_PATH = "/ws"
 
 DEFAULT_CONFIG_PATH = Path("config.toml")
 DEFAULT_BIND = "0.0.0.0"
 DEFAULT_PORT = 8080
 MAX_LINE_SIZE = 32 * 1024
+LOG_HISTORY_LINES = 1000
+LOG_QUEUE_SIZE = 1000
+BROADCAST_CHUNK_SIZE = 50
+WORKSPACE_POOL_SIZE = 4
+WEBSOCKET_HEARTBEAT = 30.0
+STREAM_READER_LIMIT = 1024 * 1024
 
 DEVNULL = "NUL" if os.name == "nt" else "/dev/null"
 GIT_COMMON_OPTIONS = ("-c", "core.hooksPath=" + DEVNULL)
+# Resolved once so each spawn skips the PATH search; falls back to a PATH lookup.
+GIT_EXECUTABLE = shutil.which("git") or "git"
 KEEP_TEMP = False
+DEBUG_LOGS = os.environ.get("GIT_WEBUI_DEBUG", "").strip().lower() in {"1", "true", "yes", "on"}
 DEFAULT_REPO_ROOT = Path("repos")
 REPO_ROOT = DEFAULT_REPO_ROOT.expanduser()
 REPO_ROOT.mkdir(parents=True, exist_ok=True)
 CONFIG_PATH = DEFAULT_CONFIG_PATH
+_SANITIZE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+_HEAD_BRANCH_RE = re.compile(r"HEAD branch:\s*(\S+)")
+_UNSAFE_REF_CHARS = frozenset(" ~^:?*[\\\x7f")
+# Snapshot the environment once; git, its credential helpers, ssh and gpg may
+# need any of it, so nothing is filtered out.
+_BASE_GIT_ENV = os.environ.copy()
+# No one is at the server's terminal to answer a credential prompt; fail instead of hanging.
+_BASE_GIT_ENV.setdefault("GIT_TERMINAL_PROMPT", "0")
 
 def _load_config(config_path: Path) -> Dict[str, object]:
     if not config_path.exists():
@@ -61,15 +86,81 @@ class CommandResult:
     stderr: str
 
 
+class WebSocketLogSender:
+    """Per-connection log queue drained by a single sender task.
+
+    Lines that pile up while a frame is being written are sent together in the
+    next frame. When the client cannot keep up, the oldest queued lines are
+    dropped and the next frame says how many were lost.
+    """
+
+    def __init__(self, websocket: web.WebSocketResponse, maxsize: int = LOG_QUEUE_SIZE) -> None:
+        self.websocket = websocket
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize)
+        self._dropped = 0
+        self._task = asyncio.create_task(self._run())
+
+    def put(self, line: str) -> None:
+        try:
+            self._queue.put_nowait(line)
+        except asyncio.QueueFull:
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self._dropped += 1
+            self._queue.put_nowait(line)
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            taken = len(batch)
+            if self._dropped:
+                batch.insert(0, f"[{self._dropped} log lines dropped]")
+                self._dropped = 0
+            try:
+                if not self.websocket.closed:
+                    await self.websocket.send_json({"type": "log", "lines": batch}, dumps=_json_dumps)
+            except ConnectionError:
+                pass
+            finally:
+                for _ in range(taken):
+                    queue.task_done()
+
+    async def drain(self) -> None:
+        """Wait until every queued line has been written to the websocket."""
+        await self._queue.join()
+
+    async def close(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
 @dataclass
 class LogSink:
-    entries: List[str]
-    websocket: Optional[web.WebSocketResponse] = None
+    """Collects submission log lines.
+
+    With a websocket sender attached, lines are streamed and not retained;
+    otherwise the most recent LOG_HISTORY_LINES are kept in ``entries``.
+    """
+
+    entries: Deque[str] = field(default_factory=lambda: deque(maxlen=LOG_HISTORY_LINES))
+    sender: Optional[WebSocketLogSender] = None
 
     def append(self, message: str) -> None:
-        self.entries.append(message)
-        if self.websocket and not self.websocket.closed:
-            asyncio.create_task(self.websocket.send_json({"type": "log", "line": message}))
+        if self.sender is not None:
+            self.sender.put(message)
+        else:
+            self.entries.append(message)
+
+    async def drain(self) -> None:
+        """Wait until every appended line has been sent to the websocket."""
+        if self.sender is not None:
+            await self.sender.drain()
 
 
 async def run_command(
@@ -77,35 +168,83 @@ async def run_command(
     cwd: Optional[Path] = None,
     env: Optional[Dict[str, str]] = None,
     log: Optional[LogSink] = None,
+    stdin_bytes: Optional[bytes] = None,
 ) -> CommandResult:
-    """Run a command asynchronously and capture its output."""
+    """Run a command asynchronously, streaming its output to the log as it arrives."""
     printable_cmd = " ".join(cmd)
     if log is not None:
         log.append(_timestamped(f"$ {printable_cmd}"))
+    # Descriptors opened by Python (listening sockets, websocket connections,
+    # config files) are non-inheritable per PEP 446, so skipping the close_fds
+    # sweep leaks nothing into git and saves a per-spawn walk of the fd table.
     process = await asyncio.create_subprocess_exec(
         *cmd,
+        stdin=asyncio.subprocess.PIPE if stdin_bytes is not None else None,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
         cwd=str(cwd) if cwd else None,
         env=env,
+        close_fds=False,
+        limit=STREAM_READER_LIMIT,
     )
-    stdout, stderr = await process.communicate()
-    stdout_text = stdout.decode("utf-8", errors="replace")
-    stderr_text = stderr.decode("utf-8", errors="replace")
-    if stdout_text and log is not None:
-        log.append(_timestamped(stdout_text.rstrip()))
-    if stderr_text and log is not None:
-        log.append(_timestamped(stderr_text.rstrip()))
+    stdout_text, stderr_text = await _stream_process(process, stdin_bytes, log)
     if log is not None:
         log.append(_timestamped(f"exit code: {process.returncode}"))
     return CommandResult(process.returncode, stdout_text, stderr_text)
 
 
+async def _pump_lines(stream: asyncio.StreamReader, log: Optional[LogSink], chunks: List[str]) -> None:
+    while True:
+        try:
+            line = await stream.readuntil(b"\n")
+        except asyncio.IncompleteReadError as exc:
+            line = exc.partial
+        except asyncio.LimitOverrunError as exc:
+            # No newline within the reader limit: pass the oversized piece on as is.
+            line = await stream.read(exc.consumed)
+        if not line:
+            return
+        text = line.decode("utf-8", errors="replace")
+        chunks.append(text)
+        if log is not None:
+            log.append(_timestamped(text.rstrip()))
+
+
+async def _feed_stdin(stream: asyncio.StreamWriter, data: bytes) -> None:
+    try:
+        stream.write(data)
+        await stream.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # The command exited without reading all of its input; its exit code says why.
+        pass
+    finally:
+        stream.close()
+
+
+async def _stream_process(
+    process: asyncio.subprocess.Process,
+    stdin_bytes: Optional[bytes],
+    log: Optional[LogSink],
+) -> Tuple[str, str]:
+    """Log a process's output line by line as it arrives, then wait for it to exit."""
+    stdout: List[str] = []
+    stderr: List[str] = []
+    tasks = [_pump_lines(process.stdout, log, stdout)]
+    if process.stderr is not None:
+        tasks.append(_pump_lines(process.stderr, log, stderr))
+    if stdin_bytes is not None:
+        tasks.append(_feed_stdin(process.stdin, stdin_bytes))
+    await asyncio.gather(*tasks)
+    await process.wait()
+    return "".join(stdout), "".join(stderr)
+
+
 async def run_git_command(
     *cmd: str,
     cwd: Optional[Path] = None,
     env: Optional[Dict[str, str]] = None,
     log: Optional[LogSink] = None,
+    stdin_bytes: Optional[bytes] = None,
 ) -> CommandResult:
     git_args = list(cmd)
     if git_args and git_args[0] == "git":
@@ -119,18 +258,138 @@ async def run_git_command(
             continue
         idx += 1
 
-    return await run_command("git", *GIT_COMMON_OPTIONS, *git_args, cwd=cwd, env=env, log=log)
+    return await run_command(
+        GIT_EXECUTABLE,
+        *GIT_COMMON_OPTIONS,
+        *git_args,
+        cwd=cwd,
+        env=env,
+        log=log,
+        stdin_bytes=stdin_bytes,
+    )
+
 
+# A git invocation (arguments after "git") paired with the error raised when it
+# fails; steps with no error message are allowed to fail. A step whose last
+# argument is "-" reads the pipeline's stdin_bytes.
+GitStep = Tuple[Tuple[str, ...], Optional[str]]
+
+
+def _reads_stdin(args: Tuple[str, ...]) -> bool:
+    return bool(args) and args[-1] == "-"
 
-def _timestamped(message: str) -> str:
-    timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-    return f"[{timestamp} UTC] {message}"
 
+def _pipeline_script(steps: Sequence[GitStep]) -> str:
+    lines = []
+    for index, (args, error) in enumerate(steps, start=1):
+        argv = (GIT_EXECUTABLE, *GIT_COMMON_OPTIONS, *args)
+        lines.append(f"printf '%s\\n' {shlex.quote('$ ' + ' '.join(argv))}")
+        lines.append(shlex.join(argv) if _reads_stdin(args) else f"{shlex.join(argv)} </dev/null")
+        lines.append("rc=$?")
+        lines.append("printf 'exit code: %s\\n' \"$rc\"")
+        if error is not None:
+            lines.append(f'[ "$rc" -eq 0 ] || exit {index}')
+    return "\n".join(lines)
 
-def _log_debug(logs: Optional[LogSink], message: str) -> None:
-    if logs is None:
+
+async def run_git_pipeline(
+    steps: Sequence[GitStep],
+    cwd: Optional[Path] = None,
+    env: Optional[Dict[str, str]] = None,
+    log: Optional[LogSink] = None,
+    stdin_bytes: Optional[bytes] = None,
+) -> None:
+    """Run git steps in a single shell process, raising the first required step's error."""
+    if not steps:
+        return
+    if os.name == "nt":
+        for args, error in steps:
+            result = await run_git_command(
+                *args,
+                cwd=cwd,
+                env=env,
+                log=log,
+                stdin_bytes=stdin_bytes if _reads_stdin(args) else None,
+            )
+            if error is not None and result.returncode != 0:
+                raise RuntimeError(error)
         return
-    logs.append(_timestamped(f"DEBUG: {message}"))
+
+    result = await _run_shell_script(
+        _pipeline_script(steps),
+        cwd=cwd,
+        env=env,
+        log=log,
+        stdin_bytes=stdin_bytes,
+    )
+    if result.returncode == 0:
+        return
+    if 1 <= result.returncode <= len(steps):
+        error = steps[result.returncode - 1][1]
+        if error is not None:
+            raise RuntimeError(error)
+    raise RuntimeError(f"git command sequence failed with exit code {result.returncode}")
+
+
+async def _run_shell_script(
+    script: str,
+    cwd: Optional[Path] = None,
+    env: Optional[Dict[str, str]] = None,
+    log: Optional[LogSink] = None,
+    stdin_bytes: Optional[bytes] = None,
+) -> CommandResult:
+    process = await asyncio.create_subprocess_exec(
+        "/bin/sh",
+        "-c",
+        script,
+        stdin=asyncio.subprocess.PIPE if stdin_bytes is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        cwd=str(cwd) if cwd else None,
+        env=env,
+        close_fds=False,
+        limit=STREAM_READER_LIMIT,
+    )
+    stdout_text, _ = await _stream_process(process, stdin_bytes, log)
+    return CommandResult(process.returncode, stdout_text, "")
+
+
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: object) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+
+_TS_CACHE = [0, ""]
+
+
+def _timestamped(message: str) -> str:
+    sec = int(time.time())
+    cache = _TS_CACHE
+    if sec != cache[0]:
+        cache[0] = sec
+        cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(sec))
+    return f"[{cache[1]} UTC] {message}"
+
+
+if DEBUG_LOGS:
+
+    def _log_debug(logs: Optional[LogSink], message: str, *args: object) -> None:
+        if logs is None:
+            return
+        if args:
+            message = message % args
+        logs.append(_timestamped(f"DEBUG: {message}"))
+
+else:
+
+    def _log_debug(logs: Optional[LogSink], message: str, *args: object) -> None:
+        return None
 
 
 def _format_ssh_key_arg(raw_path: str, resolved_path: Path) -> str:
@@ -139,12 +398,81 @@ def _format_ssh_key_arg(raw_path: str, resolved_path: Path) -> str:
     return shlex.quote(str(resolved_path))
 
 
+def _git_dir_for_refs(repo_dir: Path) -> Optional[Path]:
+    git_dir = repo_dir / ".git"
+    if not git_dir.is_dir() or (git_dir / "reftable").exists():
+        return None
+    return git_dir
+
+
+def _iter_packed_refs(git_dir: Path):
+    try:
+        with (git_dir / "packed-refs").open("r", encoding="utf-8") as packed:
+            for line in packed:
+                if line.startswith(("#", "^")):
+                    continue
+                _, _, name = line.rstrip("\n").partition(" ")
+                if name:
+                    yield name
+    except FileNotFoundError:
+        return
+
+
+def _is_plain_ref_name(ref: str) -> bool:
+    # Rejects names git never stores as refs, such as stale "*.lock" files.
+    if _UNSAFE_REF_CHARS.intersection(ref):
+        return False
+    for part in ref.split("/"):
+        if not part or part.startswith(".") or part.endswith(".lock"):
+            return False
+    return True
+
+
+def _read_local_ref(repo_dir: Path, ref: str) -> Optional[bool]:
+    """Check a ref against the files backend; None means git has to answer."""
+    git_dir = _git_dir_for_refs(repo_dir)
+    if git_dir is None or not ref.startswith("refs/") or not _is_plain_ref_name(ref):
+        return None
+    try:
+        if (git_dir / ref).is_file():
+            return True
+        return any(name == ref for name in _iter_packed_refs(git_dir))
+    except OSError:
+        return None
+
+
+def _list_local_branches(repo_dir: Path) -> Optional[List[str]]:
+    git_dir = _git_dir_for_refs(repo_dir)
+    if git_dir is None:
+        return None
+    heads_dir = git_dir / "refs" / "heads"
+    branches = set()
+    try:
+        for root, _, files in os.walk(heads_dir):
+            for name in files:
+                branch = (Path(root) / name).relative_to(heads_dir).as_posix()
+                # A git process killed mid-update leaves "<branch>.lock" behind;
+                # like for-each-ref, skip anything that is not a valid ref name.
+                if _is_plain_ref_name(branch):
+                    branches.add(branch)
+        for name in _iter_packed_refs(git_dir):
+            if name.startswith("refs/heads/"):
+                branches.add(name[len("refs/heads/"):])
+    except OSError:
+        return None
+    return sorted(branches)
+
+
 async def _git_ref_exists(
     repo_dir: Path,
     ref: str,
     env: Dict[str, str],
     logs: Optional[LogSink] = None,
 ) -> bool:
+    found = await asyncio.to_thread(_read_local_ref, repo_dir, ref)
+    if found is not None:
+        _log_debug(logs, "Ref %s %s in the git directory.", ref, "exists" if found else "not found")
+        return found
     result = await run_git_command(
         "show-ref",
         "--verify",
@@ -156,28 +484,43 @@ async def _git_ref_exists(
     return result.returncode == 0
 
 
+def _read_origin_head(repo_dir: Path) -> str:
+    """Read the origin/HEAD symref straight from the .git directory, if present."""
+    try:
+        content = (repo_dir / ".git" / "refs" / "remotes" / "origin" / "HEAD").read_text(encoding="utf-8")
+    except OSError:
+        return ""
+    content = content.strip()
+    prefix = "ref: refs/remotes/"
+    if not content.startswith(prefix):
+        return ""
+    return content[len(prefix):]
+
+
 async def _resolve_default_branch(repo_dir: Path, env: Dict[str, str], logs: Optional[LogSink] = None) -> str:
     _log_debug(logs, "Resolving default branch from origin/HEAD.")
-    default_branch_result = await run_git_command(
-        "symbolic-ref",
-        "--quiet",
-        "--short",
-        "refs/remotes/origin/HEAD",
-        cwd=repo_dir,
-        env=env,
-        log=logs,
-    )
-    if default_branch_result.returncode == 0:
-        resolved = default_branch_result.stdout.strip()
+    resolved = await asyncio.to_thread(_read_origin_head, repo_dir)
+    if resolved:
+        _log_debug(logs, "Read origin/HEAD -> '%s' from the git directory.", resolved)
     else:
-        resolved = ""
+        default_branch_result = await run_git_command(
+            "symbolic-ref",
+            "--quiet",
+            "--short",
+            "refs/remotes/origin/HEAD",
+            cwd=repo_dir,
+            env=env,
+            log=logs,
+        )
+        if default_branch_result.returncode == 0:
+            resolved = default_branch_result.stdout.strip()
 
     if resolved:
         candidate = resolved
         if candidate.startswith("origin/"):
             candidate = candidate.split("/", 1)[1]
         if not await _git_ref_exists(repo_dir, f"refs/remotes/origin/{candidate}", env, logs):
-            _log_debug(logs, f"origin/HEAD points to missing ref '{resolved}'; falling back.")
+            _log_debug(logs, "origin/HEAD points to missing ref '%s'; falling back.", resolved)
             resolved = ""
 
     if not resolved:
@@ -191,7 +534,7 @@ async def _resolve_default_branch(repo_dir: Path, env: Dict[str, str], logs: Opt
             log=logs,
         )
         if remote_show_result.returncode == 0:
-            match = re.search(r"HEAD branch:\s*(\S+)", remote_show_result.stdout)
+            match = _HEAD_BRANCH_RE.search(remote_show_result.stdout)
             if match:
                 resolved = match.group(1).strip()
 
@@ -211,17 +554,49 @@ async def _resolve_default_branch(repo_dir: Path, env: Dict[str, str], logs: Opt
         raise RuntimeError("Resolved default branch name is empty")
     if not await _git_ref_exists(repo_dir, f"refs/remotes/origin/{resolved}", env, logs):
         raise RuntimeError(f"origin/{resolved} does not exist")
-    _log_debug(logs, f"Resolved default branch '{resolved}'.")
+    _log_debug(logs, "Resolved default branch '%s'.", resolved)
     return resolved
 
 
-async def _generate_unique_temp_branch(repo_dir: Path, env: Dict[str, str], logs: Optional[LogSink] = None) -> str:
-    while True:
-        candidate = f"tmp-clean-{secrets.token_hex(4)}"
-        if not await _git_ref_exists(repo_dir, f"refs/heads/{candidate}", env, logs):
-            _log_debug(logs, f"Generated temporary branch '{candidate}'.")
-            return candidate
-        _log_debug(logs, f"Temporary branch '{candidate}' already exists; regenerating.")
+def _targeted_fetch_branches(
+    repo_dir: Path,
+    branch_mode: str,
+    branch: str,
+    new_branch: str,
+    base_commit: str,
+) -> Optional[List[str]]:
+    """Return the origin branches a submission needs, or None when a full fetch is required."""
+    default_branch = _read_origin_head(repo_dir)
+    if not default_branch.startswith("origin/"):
+        return None
+    default_branch = default_branch.split("/", 1)[1]
+    if not default_branch:
+        return None
+
+    if branch_mode == "from_commit":
+        if base_commit and base_commit.upper() != "HEAD":
+            return None
+        wanted = [default_branch]
+    elif branch_mode == "revert_to_commit":
+        return None
+    elif branch_mode == "merge_branches":
+        wanted = [default_branch, branch, new_branch]
+    elif branch_mode == "orphan":
+        wanted = [default_branch]
+    else:
+        wanted = [default_branch, branch]
+
+    branches: List[str] = []
+    for name in wanted:
+        if not name or name in branches:
+            continue
+        # A branch this clone has never seen on origin (typically a new branch
+        # about to be pushed) would make the targeted fetch fail and fall back
+        # to a second, full fetch; do the full fetch straight away instead.
+        if name != default_branch and not _read_local_ref(repo_dir, f"refs/remotes/origin/{name}"):
+            return None
+        branches.append(name)
+    return branches
 
 
 async def _reset_cached_repo_state(
@@ -232,152 +607,60 @@ async def _reset_cached_repo_state(
     target_branch: Optional[str],
 ) -> None:
     _log_debug(logs, "Pre-cleaning cached repository state before switching branches.")
-    reset_before_result = await run_git_command(
-        "reset",
-        "--hard",
-        cwd=repo_dir,
-        env=env,
-        log=logs,
-    )
-    if reset_before_result.returncode != 0:
-        raise RuntimeError("git reset --hard failed before orphan switch")
-    clean_before_result = await run_git_command(
-        "clean",
-        "-fd",
-        cwd=repo_dir,
-        env=env,
-        log=logs,
-    )
-    if clean_before_result.returncode != 0:
-        raise RuntimeError("git clean -fd failed before orphan switch")
-
-    tmp_branch = await _generate_unique_temp_branch(repo_dir, env, logs)
-    _log_debug(logs, f"Switching to orphan temporary branch '{tmp_branch}'.")
-    orphan_result = await run_git_command(
-        "switch",
-        "--orphan",
-        tmp_branch,
-        cwd=repo_dir,
-        env=env,
-        log=logs,
-    )
-    if orphan_result.returncode != 0:
-        raise RuntimeError("Failed to create temporary orphan branch")
-
-    _log_debug(logs, "Creating empty commit on temporary branch.")
-    commit_result = await run_git_command(
-        "-c",
-        "user.name=git-webui",
-        "-c",
-        "user.email=git-webui@localhost",
-        "commit",
-        "--allow-empty",
-        "-m",
-        "temporary cleanup branch",
-        cwd=repo_dir,
-        env=env,
-        log=logs,
-    )
-    if commit_result.returncode != 0:
-        raise RuntimeError("Failed to create temporary empty commit")
-
-    branches_result = await run_git_command(
-        "for-each-ref",
-        "--format=%(refname:short)",
-        "refs/heads/",
-        cwd=repo_dir,
-        env=env,
-        log=logs,
-    )
-    if branches_result.returncode != 0:
-        raise RuntimeError("Failed to list local branches")
-    branches = [line.strip() for line in branches_result.stdout.splitlines() if line.strip()]
-    for branch in branches:
-        if branch == tmp_branch:
-            continue
-        _log_debug(logs, f"Deleting local branch '{branch}'.")
-        delete_result = await run_git_command(
-            "branch",
-            "-D",
-            branch,
+    branches = await asyncio.to_thread(_list_local_branches, repo_dir)
+    if branches is None:
+        branches_result = await run_git_command(
+            "for-each-ref",
+            "--format=%(refname:short)",
+            "refs/heads/",
             cwd=repo_dir,
             env=env,
             log=logs,
         )
-        if delete_result.returncode != 0:
-            raise RuntimeError(f"Failed to delete branch {branch}")
-
-    _log_debug(logs, f"Recreating default branch '{default_branch}' from origin/{default_branch}.")
-    switch_default_result = await run_git_command(
-        "switch",
-        "-C",
-        default_branch,
-        f"origin/{default_branch}",
-        cwd=repo_dir,
-        env=env,
-        log=logs,
-    )
-    if switch_default_result.returncode != 0:
-        raise RuntimeError(f"Failed to reset default branch {default_branch}")
-
-    _log_debug(logs, "Resetting and cleaning working tree.")
-    reset_result = await run_git_command(
-        "reset",
-        "--hard",
-        cwd=repo_dir,
-        env=env,
-        log=logs,
-    )
-    if reset_result.returncode != 0:
-        raise RuntimeError("git reset --hard failed")
-    clean_result = await run_git_command(
-        "clean",
-        "-fd",
-        cwd=repo_dir,
-        env=env,
-        log=logs,
+        if branches_result.returncode != 0:
+            raise RuntimeError("Failed to list local branches")
+        branches = [line.strip() for line in branches_result.stdout.splitlines() if line.strip()]
+
+    # Detaching HEAD lets every local branch be deleted without creating a
+    # throwaway orphan branch, and the whole reset runs as one shell process.
+    # Detach onto an explicit commit: a failed orphan submission can leave
+    # HEAD on an unborn branch, where a bare "switch --detach" fails.
+    steps: List[GitStep] = [
+        (("reset", "--hard"), "git reset --hard failed before detaching HEAD"),
+        (("clean", "-fd"), "git clean -fd failed before detaching HEAD"),
+        (
+            ("switch", "--detach", f"origin/{default_branch}"),
+            "Failed to detach HEAD before deleting local branches",
+        ),
+    ]
+    if branches:
+        _log_debug(logs, "Deleting local branches: %s.", ", ".join(branches))
+        steps.append((("branch", "-D", *branches), f"Failed to delete branches {', '.join(branches)}"))
+
+    _log_debug(logs, "Recreating default branch '%s' from origin/%s.", default_branch, default_branch)
+    steps.append(
+        (
+            ("switch", "-C", default_branch, f"origin/{default_branch}"),
+            f"Failed to reset default branch {default_branch}",
+        )
     )
-    if clean_result.returncode != 0:
-        raise RuntimeError("git clean -fd failed")
+    steps.append((("reset", "--hard"), "git reset --hard failed"))
+    steps.append((("clean", "-fd"), "git clean -fd failed"))
 
     if target_branch:
         if await _git_ref_exists(repo_dir, f"refs/remotes/origin/{target_branch}", env, logs):
-            _log_debug(logs, f"Switching to target branch '{target_branch}' from origin/{target_branch}.")
-            target_result = await run_git_command(
-                "switch",
-                "-C",
-                target_branch,
-                f"origin/{target_branch}",
-                cwd=repo_dir,
-                env=env,
-                log=logs,
+            _log_debug(logs, "Switching to target branch '%s' from origin/%s.", target_branch, target_branch)
+            steps.append(
+                (
+                    ("switch", "-C", target_branch, f"origin/{target_branch}"),
+                    f"Failed to switch to origin/{target_branch}",
+                )
             )
-            if target_result.returncode != 0:
-                raise RuntimeError(f"Failed to switch to origin/{target_branch}")
         else:
-            _log_debug(logs, f"Creating new local branch '{target_branch}' from default branch.")
-            create_target_result = await run_git_command(
-                "switch",
-                "-c",
-                target_branch,
-                cwd=repo_dir,
-                env=env,
-                log=logs,
-            )
-            if create_target_result.returncode != 0:
-                raise RuntimeError(f"Failed to create local branch {target_branch}")
-
-    _log_debug(logs, f"Deleting temporary branch '{tmp_branch}'.")
-    delete_tmp_result = await run_git_command(
-        "branch",
-        "-D",
-        tmp_branch,
-        cwd=repo_dir,
-        env=env,
-        log=logs,
-    )
-    if delete_tmp_result.returncode != 0:
-        raise RuntimeError(f"Failed to delete temporary branch {tmp_branch}")
+            _log_debug(logs, "Creating new local branch '%s' from default branch.", target_branch)
+            steps.append((("switch", "-c", target_branch), f"Failed to create local branch {target_branch}"))
+
+    await run_git_pipeline(steps, cwd=repo_dir, env=env, log=logs)
 
 
 def _parse_port(value: object) -> int:
@@ -463,12 +746,60 @@ def _frontend_root() -> Path:
     return Path(__file__).resolve().parent.parent / "frontend"
 
 
-def _repo_workspace_for_url(repository_url: str) -> Path:
+@lru_cache(maxsize=256)
+def _repo_dir_name(repository_url: str) -> str:
     repo_name = Path(repository_url.rstrip("/")).name
     repo_name = repo_name[:-4] if repo_name.endswith(".git") else repo_name
-    repo_name = re.sub(r"[^A-Za-z0-9._-]+", "-", repo_name).strip("-") or "repo"
-    digest = hashlib.sha256(repository_url.encode("utf-8")).hexdigest()[:10]
-    return REPO_ROOT / f"{repo_name}-{digest}"
+    repo_name = _SANITIZE_RE.sub("-", repo_name).strip("-") or "repo"
+    digest = hashlib.sha256(repository_url.encode("utf-8")).digest()[:5].hex()
+    return f"{repo_name}-{digest}"
+
+
+def _repo_workspace_for_url(repository_url: str) -> Path:
+    # Only the name is cached; REPO_ROOT can change when the runtime is configured.
+    return REPO_ROOT / _repo_dir_name(repository_url)
+
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+
+def _write_file_bytes(path: Path, data: bytes) -> None:
+    # Content is already LF-normalized, so write the encoded bytes straight to
+    # the fd instead of going through the buffered text I/O stack.
+    fd = os.open(path, _WRITE_FLAGS, 0o600)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+_WORKSPACE_POOL: List[Path] = []
+
+
+def _acquire_workspace() -> Path:
+    if _WORKSPACE_POOL:
+        return _WORKSPACE_POOL.pop()
+    return Path(tempfile.mkdtemp(prefix="git-webui-"))
+
+
+def _release_workspace(workdir: Path) -> None:
+    # Emptying a pooled directory is a couple of unlinks; mkdtemp + rmtree per
+    # submission costs a fresh directory and a recursive walk every time.
+    if len(_WORKSPACE_POOL) < WORKSPACE_POOL_SIZE:
+        try:
+            for entry in os.scandir(workdir):
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+        except OSError:
+            pass
+        else:
+            _WORKSPACE_POOL.append(workdir)
+            return
+    shutil.rmtree(workdir, ignore_errors=True)
 
 
 @contextmanager
@@ -479,12 +810,18 @@ def _temporary_workspace(logs: Optional[LogSink] = None) -> Path:
         if logs is not None:
             logs.append(_timestamped(f"Keeping temporary workspace at {workdir}"))
         _log_debug(logs, "Temporary workspace will be preserved for debugging.")
-        try:
-            yield workdir
-        finally:
-            pass
-    with tempfile.TemporaryDirectory(prefix="git-webui-") as tmpdir:
-        yield Path(tmpdir)
+        yield workdir
+        return
+    workdir = _acquire_workspace()
+    try:
+        yield workdir
+    finally:
+        _release_workspace(workdir)
+
+
+async def clear_workspace_pool(app: web.Application) -> None:
+    while _WORKSPACE_POOL:
+        shutil.rmtree(_WORKSPACE_POOL.pop(), ignore_errors=True)
 
 
 def _find_default_index(entries: List[Dict[str, str]]) -> Optional[int]:
@@ -541,13 +878,31 @@ def _serialize_config() -> Dict[str, object]:
     }
 
 
+_CONFIG_JSON_CACHE: List[object] = [None, ""]
+
+
+def _serialized_config_json() -> str:
+    # APP_CONFIG is replaced, never mutated, so its identity keys the cache.
+    cache = _CONFIG_JSON_CACHE
+    if cache[0] is not APP_CONFIG:
+        cache[1] = _json_dumps(_serialize_config())
+        cache[0] = APP_CONFIG
+    return cache[1]
 
 
 def _normalize_form_payload(form: Dict[str, str]) -> Dict[str, str]:
-    normalized = {}
-    for key, value in form.items():
-        normalized[key] = value if isinstance(value, str) else str(value)
-    return normalized
+    # The frontend sends strings, so the usual case hands the dict back untouched.
+    for value in form.values():
+        if not isinstance(value, str):
+            return {key: value if isinstance(value, str) else str(value) for key, value in form.items()}
+    return form
+
+
+def _normalize_newlines(text: str) -> str:
+    # Most payloads arrive with LF endings; only pay for a copy when CR is present.
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n")
 
 
 async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, object]:
@@ -559,25 +914,24 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
     ssh_key_selection = form.get("ssh_key_path", "").strip()
     branch_mode = form.get("branch_mode", "default").strip()
     base_commit = form.get("base_commit", "").strip()
-    commit_message = form.get("commit_message", "").replace("\r\n", "\n")
-    commit_message = commit_message.strip("\n")
+    commit_message = _normalize_newlines(form.get("commit_message", "")).strip("\n")
     allow_empty_commit = form.get("allow_empty_commit") == "true"
-    patch_content = form.get("patch", "").replace("\r\n", "\n")
+    patch_content = _normalize_newlines(form.get("patch", ""))
     if branch_mode in {"from_commit", "revert_to_commit"}:
         commit_message = ""
         allow_empty_commit = False
         patch_content = ""
 
-    _log_debug(logs, f"Parsed repository_url='{repository_url}'.")
-    _log_debug(logs, f"Parsed branch='{branch or '(default)'}'.")
-    _log_debug(logs, f"Parsed new_branch='{new_branch or '(none)'}'.")
-    _log_debug(logs, f"Parsed branch_mode='{branch_mode}'.")
-    _log_debug(logs, f"Parsed base_commit='{base_commit or '(none)'}'.")
-    _log_debug(logs, f"Parsed git_user selection='{git_user_selection or '(none)'}'.")
-    _log_debug(logs, f"Parsed ssh_key selection='{ssh_key_selection or '(none)'}'.")
-    _log_debug(logs, f"Commit message length={len(commit_message)}.")
-    _log_debug(logs, f"Allow empty commit={allow_empty_commit}.")
-    _log_debug(logs, f"Patch length={len(patch_content)}.")
+    _log_debug(logs, "Parsed repository_url='%s'.", repository_url)
+    _log_debug(logs, "Parsed branch='%s'.", branch or "(default)")
+    _log_debug(logs, "Parsed new_branch='%s'.", new_branch or "(none)")
+    _log_debug(logs, "Parsed branch_mode='%s'.", branch_mode)
+    _log_debug(logs, "Parsed base_commit='%s'.", base_commit or "(none)")
+    _log_debug(logs, "Parsed git_user selection='%s'.", git_user_selection or "(none)")
+    _log_debug(logs, "Parsed ssh_key selection='%s'.", ssh_key_selection or "(none)")
+    _log_debug(logs, "Commit message length=%s.", len(commit_message))
+    _log_debug(logs, "Allow empty commit=%s.", allow_empty_commit)
+    _log_debug(logs, "Patch length=%s.", len(patch_content))
 
     target_branch = new_branch if branch_mode in {"from_commit", "orphan"} else (branch if branch_mode in {"default", "merge_branches"} else None)
     form_values = {
@@ -600,7 +954,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
             user_entry = APP_CONFIG["git_users"][user_idx]
             user_name = user_entry.get("name", "").strip()
             user_email = user_entry.get("email", "").strip()
-            _log_debug(logs, f"Resolved git user index={user_idx} name='{user_name}'.")
+            _log_debug(logs, "Resolved git user index=%s name='%s'.", user_idx, user_name)
         except (ValueError, IndexError):
             logs.append(_timestamped("Invalid Git user selection."))
             return {"form_values": form_values, "success": False}
@@ -643,15 +997,20 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
         _log_debug(logs, "Branch A and Branch B are identical in merge mode.")
         logs.append(_timestamped("Branch A and Branch B must be different for merge mode."))
         return {"form_values": form_values, "success": False}
+    if branch_mode in {"default", "orphan"} and not patch_content.strip() and not commit_message:
+        # Nothing would be applied, committed or pushed; skip the workspace and git entirely.
+        logs.append(_timestamped("No patch or commit message provided; nothing to do."))
+        return {"form_values": form_values, "success": True}
 
     ssh_key_path: Optional[Path] = None
 
     try:
         with _temporary_workspace(logs) as workdir:
             repo_dir = _repo_workspace_for_url(repository_url)
-            env = os.environ.copy()
-            _log_debug(logs, f"Created temporary workspace at {workdir}.")
-            _log_debug(logs, f"Repository directory will be {repo_dir}.")
+            # Shared read-only unless an SSH key needs its own GIT_SSH_COMMAND.
+            env = _BASE_GIT_ENV
+            _log_debug(logs, "Created temporary workspace at %s.", workdir)
+            _log_debug(logs, "Repository directory will be %s.", repo_dir)
 
             if ssh_key_selection:
                 try:
@@ -662,33 +1021,55 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 except (ValueError, IndexError):
                     raise RuntimeError("Invalid SSH key selection") from None
 
-                if not ssh_key_path or not ssh_key_path.exists():
+                if not ssh_key_path or not await asyncio.to_thread(ssh_key_path.exists):
                     raise RuntimeError(f"SSH key path not found: {ssh_key_path}")
 
                 ssh_key_arg = _format_ssh_key_arg(raw_ssh_key_path, ssh_key_path)
-                env["GIT_SSH_COMMAND"] = f"ssh -i {ssh_key_arg} -o StrictHostKeyChecking=no"
+                env = {**_BASE_GIT_ENV, "GIT_SSH_COMMAND": f"ssh -i {ssh_key_arg} -o StrictHostKeyChecking=no"}
                 logs.append(_timestamped(f"Using SSH key: {ssh_key_path}"))
-                _log_debug(logs, f"GIT_SSH_COMMAND set to: {env['GIT_SSH_COMMAND']}")
+                _log_debug(logs, "GIT_SSH_COMMAND set to: %s", env["GIT_SSH_COMMAND"])
             else:
                 _log_debug(logs, "No SSH key selected; using default SSH configuration.")
 
             repo_prepared = False
             default_branch = ""
-            if repo_dir.exists():
-                if not (repo_dir / ".git").exists():
+            repo_exists, git_dir_exists = await asyncio.gather(
+                asyncio.to_thread(repo_dir.exists),
+                asyncio.to_thread((repo_dir / ".git").exists),
+            )
+            if repo_exists:
+                if not git_dir_exists:
                     raise RuntimeError(f"Existing repository path is not a git repo: {repo_dir}")
                 logs.append(_timestamped(f"Using existing repository at {repo_dir}"))
-                _log_debug(logs, "Fetching latest changes from all remotes.")
-                fetch_result = await run_git_command(
-                    "fetch",
-                    "--prune",
-                    "--all",
-                    cwd=repo_dir,
-                    env=env,
-                    log=logs,
+                fetch_branches = await asyncio.to_thread(
+                    _targeted_fetch_branches, repo_dir, branch_mode, branch, new_branch, base_commit
                 )
-                if fetch_result.returncode != 0:
-                    raise RuntimeError("git fetch failed")
+                fetch_result = None
+                if fetch_branches:
+                    _log_debug(logs, "Fetching only %s from origin.", ", ".join(fetch_branches))
+                    fetch_result = await run_git_command(
+                        "fetch",
+                        "--prune",
+                        "origin",
+                        *fetch_branches,
+                        cwd=repo_dir,
+                        env=env,
+                        log=logs,
+                    )
+                    if fetch_result.returncode != 0:
+                        _log_debug(logs, "Targeted fetch failed; falling back to fetching all remotes.")
+                if fetch_result is None or fetch_result.returncode != 0:
+                    _log_debug(logs, "Fetching latest changes from all remotes.")
+                    fetch_result = await run_git_command(
+                        "fetch",
+                        "--prune",
+                        "--all",
+                        cwd=repo_dir,
+                        env=env,
+                        log=logs,
+                    )
+                    if fetch_result.returncode != 0:
+                        raise RuntimeError("git fetch failed")
                 _log_debug(logs, "git fetch completed.")
                 default_branch = await _resolve_default_branch(repo_dir, env, logs)
                 if branch_mode == "default" and not branch:
@@ -700,7 +1081,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
             else:
                 logs.append(_timestamped(f"Cloning repository {repository_url}"))
                 _log_debug(logs, "Starting git clone.")
-                repo_dir.parent.mkdir(parents=True, exist_ok=True)
+                await asyncio.to_thread(repo_dir.parent.mkdir, parents=True, exist_ok=True)
                 clone_result = await run_git_command(
                     "clone",
                     repository_url,
@@ -712,36 +1093,6 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                     raise RuntimeError("git clone failed")
                 _log_debug(logs, "git clone completed.")
 
-            if user_name:
-                _log_debug(logs, "Configuring git user.name.")
-                config_result = await run_git_command(
-                    "config",
-                    "--local",
-                    "user.name",
-                    user_name,
-                    cwd=repo_dir,
-                    env=env,
-                    log=logs,
-                )
-                if config_result.returncode != 0:
-                    raise RuntimeError("Failed to set git user.name")
-                _log_debug(logs, "git user.name configured.")
-
-            if user_email:
-                _log_debug(logs, "Configuring git user.email.")
-                config_result = await run_git_command(
-                    "config",
-                    "--local",
-                    "user.email",
-                    user_email,
-                    cwd=repo_dir,
-                    env=env,
-                    log=logs,
-                )
-                if config_result.returncode != 0:
-                    raise RuntimeError("Failed to set git user.email")
-                _log_debug(logs, "git user.email configured.")
-
             if branch_mode == "default" and not branch:
                 default_branch = default_branch or await _resolve_default_branch(repo_dir, env, logs)
                 branch = default_branch
@@ -751,9 +1102,9 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                     default_branch = default_branch or await _resolve_default_branch(repo_dir, env, logs)
                     base_commit = f"origin/{default_branch}"
                     logs.append(_timestamped(f"Using {base_commit} as the base for branch creation."))
-                    _log_debug(logs, f"Resolved base commit to '{base_commit}' for branch creation.")
+                    _log_debug(logs, "Resolved base commit to '%s' for branch creation.", base_commit)
                 logs.append(_timestamped(f"Creating branch {new_branch} from commit {base_commit}."))
-                _log_debug(logs, f"Creating branch '{new_branch}' from commit '{base_commit}'.")
+                _log_debug(logs, "Creating branch '%s' from commit '%s'.", new_branch, base_commit)
                 create_branch_result = await run_git_command(
                     "checkout",
                     "-b",
@@ -765,7 +1116,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 )
                 if create_branch_result.returncode != 0:
                     raise RuntimeError("Failed to create branch from commit")
-                _log_debug(logs, f"Branch '{new_branch}' created from commit.")
+                _log_debug(logs, "Branch '%s' created from commit.", new_branch)
                 _log_debug(logs, "Pushing branch created from commit to origin.")
                 push_result = await run_git_command(
                     "push",
@@ -784,7 +1135,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 logs.append(_timestamped(f"Resetting branch {branch} to commit {base_commit}."))
                 if not await _git_ref_exists(repo_dir, f"refs/remotes/origin/{branch}", env, logs):
                     raise RuntimeError(f"Branch '{branch}' does not exist on origin for revert mode")
-                _log_debug(logs, f"Checking out existing branch '{branch}' from origin for revert mode.")
+                _log_debug(logs, "Checking out existing branch '%s' from origin for revert mode.", branch)
                 checkout_result = await run_git_command(
                     "switch",
                     "-C",
@@ -796,7 +1147,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 )
                 if checkout_result.returncode != 0:
                     raise RuntimeError("Failed to checkout branch for revert mode")
-                _log_debug(logs, f"Resetting branch '{branch}' to commit '{base_commit}'.")
+                _log_debug(logs, "Resetting branch '%s' to commit '%s'.", branch, base_commit)
                 reset_result = await run_git_command(
                     "reset",
                     "--hard",
@@ -807,7 +1158,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 )
                 if reset_result.returncode != 0:
                     raise RuntimeError("git reset --hard failed")
-                _log_debug(logs, f"Force-pushing branch '{branch}' to origin.")
+                _log_debug(logs, "Force-pushing branch '%s' to origin.", branch)
                 push_result = await run_git_command(
                     "push",
                     "-f",
@@ -824,7 +1175,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 return {"form_values": form_values, "success": success}
             elif branch_mode == "orphan":
                 logs.append(_timestamped(f"Creating orphan branch {new_branch}."))
-                _log_debug(logs, f"Creating orphan branch '{new_branch}'.")
+                _log_debug(logs, "Creating orphan branch '%s'.", new_branch)
                 create_branch_result = await run_git_command(
                     "checkout",
                     "--orphan",
@@ -850,7 +1201,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                     raise RuntimeError(f"Branch '{branch}' does not exist on origin")
                 if not await _git_ref_exists(repo_dir, f"refs/remotes/origin/{new_branch}", env, logs):
                     raise RuntimeError(f"Branch '{new_branch}' does not exist on origin")
-                _log_debug(logs, f"Checking out branch '{branch}' from origin for merge mode.")
+                _log_debug(logs, "Checking out branch '%s' from origin for merge mode.", branch)
                 checkout_result = await run_git_command(
                     "switch",
                     "-C",
@@ -862,7 +1213,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 )
                 if checkout_result.returncode != 0:
                     raise RuntimeError("Failed to checkout branch A for merge mode")
-                _log_debug(logs, f"Merging branch '{new_branch}' into '{branch}'.")
+                _log_debug(logs, "Merging branch '%s' into '%s'.", new_branch, branch)
                 merge_result = await run_git_command(
                     "merge",
                     "--ff-only",
@@ -873,7 +1224,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 )
                 if merge_result.returncode != 0:
                     raise RuntimeError("git merge failed (possibly due to conflicts)")
-                _log_debug(logs, f"Pushing merged branch '{branch}' to origin.")
+                _log_debug(logs, "Pushing merged branch '%s' to origin.", branch)
                 push_result = await run_git_command(
                     "push",
                     "origin",
@@ -884,7 +1235,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 )
                 if push_result.returncode != 0:
                     raise RuntimeError("git push failed")
-                _log_debug(logs, f"Deleting merged source branch '{new_branch}' on origin.")
+                _log_debug(logs, "Deleting merged source branch '%s' on origin.", new_branch)
                 delete_remote_result = await run_git_command(
                     "push",
                     "origin",
@@ -897,7 +1248,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 if delete_remote_result.returncode != 0:
                     raise RuntimeError("Failed to delete source branch on origin")
                 if await _git_ref_exists(repo_dir, f"refs/heads/{new_branch}", env, logs):
-                    _log_debug(logs, f"Deleting merged source branch '{new_branch}' locally.")
+                    _log_debug(logs, "Deleting merged source branch '%s' locally.", new_branch)
                     delete_local_result = await run_git_command(
                         "branch",
                         "-d",
@@ -912,7 +1263,9 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 success = True
                 return {"form_values": form_values, "success": success}
             elif branch and not repo_prepared:
-                _log_debug(logs, f"Checking out branch '{branch}'.")
+                # The clone has just fetched origin, so the checkout is already
+                # current and needs no pull or fast-forward afterwards.
+                _log_debug(logs, "Checking out branch '%s'.", branch)
                 checkout_result = await run_git_command(
                     "checkout",
                     branch,
@@ -922,7 +1275,7 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                 )
                 if checkout_result.returncode != 0:
                     logs.append(_timestamped(f"Branch {branch} not found. Creating new branch."))
-                    _log_debug(logs, f"Creating new branch '{branch}'.")
+                    _log_debug(logs, "Creating new branch '%s'.", branch)
                     create_branch_result = await run_git_command(
                         "checkout",
                         "-b",
@@ -933,128 +1286,72 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
                     )
                     if create_branch_result.returncode != 0:
                         raise RuntimeError("Failed to create branch")
-                    _log_debug(logs, f"Branch '{branch}' created.")
-                else:
-                    _log_debug(logs, f"Pulling latest changes for branch '{branch}'.")
-                    pull_result = await run_git_command(
-                        "pull",
-                        "--ff-only",
-                        "origin",
-                        branch,
-                        cwd=repo_dir,
-                        env=env,
-                        log=logs,
-                    )
-                    if pull_result.returncode != 0:
-                        raise RuntimeError("git pull failed")
+                    _log_debug(logs, "Branch '%s' created.", branch)
             elif not repo_prepared:
                 _log_debug(logs, "No branch specified; using default branch.")
-                await run_git_command(
-                    "status",
-                    "-sb",
-                    cwd=repo_dir,
-                    env=env,
-                    log=logs,
-                )
-                _log_debug(logs, "Pulling latest changes for default branch.")
-                pull_result = await run_git_command(
-                    "pull",
-                    "--ff-only",
-                    cwd=repo_dir,
-                    env=env,
-                    log=logs,
-                )
-                if pull_result.returncode != 0:
-                    raise RuntimeError("git pull failed")
 
+            steps: List[GitStep] = []
+            patch_bytes: Optional[bytes] = None
             if patch_content.strip():
-                patch_path = workdir / "patch.diff"
                 logs.append(_timestamped(patch_content))
-                patch_path.write_text(patch_content, encoding="utf-8", newline="\n")
-                logs.append(_timestamped("Patch written to temporary file."))
-                _log_debug(logs, f"Patch file saved to {patch_path}.")
-
-                _log_debug(logs, "Applying patch with git apply --3way -v.")
-                apply_result = await run_git_command(
-                    "apply",
-                    "--3way",
-                    "-v",
-                    str(patch_path),
-                    cwd=repo_dir,
-                    env=env,
-                    log=logs,
-                )
-                if apply_result.returncode != 0:
-                    raise RuntimeError("git apply failed")
-                _log_debug(logs, "Patch applied successfully.")
+                patch_bytes = patch_content.encode("utf-8")
+                # Applying straight to the index leaves the working tree alone (the
+                # cache is reset before its next use) and makes "git add -A" unnecessary.
+                _log_debug(logs, "Applying patch to the index with git apply --cached --3way -v from stdin.")
+                steps.append((("apply", "--cached", "--3way", "-v", "-"), "git apply failed"))
             else:
                 logs.append(_timestamped("No patch provided; skipping git apply."))
                 _log_debug(logs, "Patch skipped because content is empty.")
 
-            _log_debug(logs, "Staging changes with git add -A.")
-            await run_git_command(
-                "add",
-                "-A",
-                cwd=repo_dir,
-                env=env,
-                log=logs,
-            )
-
-            _log_debug(logs, "Checking git status after staging.")
-            await run_git_command(
-                "status",
-                "-sb",
-                cwd=repo_dir,
-                env=env,
-                log=logs,
-            )
+            if DEBUG_LOGS:
+                # The working tree is left stale by "apply --cached", so summarize
+                # the index rather than running "git status".
+                _log_debug(logs, "Summarizing staged changes.")
+                steps.append((("diff", "--cached", "--stat"), None))
 
             if commit_message:
                 commit_file = workdir / "commit_message.txt"
-                commit_file.write_text(commit_message, encoding="utf-8", newline="\n")
-                _log_debug(logs, f"Commit message file saved to {commit_file}.")
-                _log_debug(logs, "Creating git commit.")
-                commit_command = [
-                    "commit",
-                ]
+                _write_file_bytes(commit_file, commit_message.encode("utf-8"))
+                _log_debug(logs, "Commit message file saved to %s.", commit_file)
+                _log_debug(logs, "Creating git commit and pushing to origin.")
+                # The identity only applies to this commit; nothing is written
+                # to the cached repository's config.
+                commit_command = []
+                if user_name:
+                    commit_command.extend(["-c", f"user.name={user_name}"])
+                if user_email:
+                    commit_command.extend(["-c", f"user.email={user_email}"])
+                commit_command.append("commit")
                 if allow_empty_commit:
                     commit_command.append("--allow-empty")
                 commit_command.extend(["-F", str(commit_file)])
-                commit_result = await run_git_command(
-                    *commit_command,
-                    cwd=repo_dir,
-                    env=env,
-                    log=logs,
+                steps.append((tuple(commit_command), "git commit failed"))
+                steps.append(
+                    (
+                        ("push", "origin", f"HEAD:{target_branch}" if target_branch else "HEAD"),
+                        "git push failed",
+                    )
                 )
-                if commit_result.returncode != 0:
-                    raise RuntimeError("git commit failed")
-                _log_debug(logs, "git commit completed.")
             else:
                 logs.append(_timestamped("No commit message provided. Skipping commit."))
                 _log_debug(logs, "Commit skipped due to empty commit message.")
 
+            await run_git_pipeline(steps, cwd=repo_dir, env=env, log=logs, stdin_bytes=patch_bytes)
+            if patch_content.strip():
+                _log_debug(logs, "Patch applied successfully.")
             if commit_message:
-                _log_debug(logs, "Pushing commit to origin.")
-                push_result = await run_git_command(
-                    "push",
-                    "origin",
-                    f"HEAD:{target_branch}" if target_branch else "HEAD",
-                    cwd=repo_dir,
-                    env=env,
-                    log=logs,
-                )
-                if push_result.returncode != 0:
-                    raise RuntimeError("git push failed")
                 logs.append(_timestamped("Patch applied, committed, and pushed successfully."))
-                _log_debug(logs, "git push completed.")
+                _log_debug(logs, "git commit and push completed.")
             else:
                 logs.append(_timestamped("Push skipped because no commit was created."))
                 _log_debug(logs, "Push skipped due to missing commit.")
             success = True
     except Exception as exc:  # noqa: BLE001
-        tb_str = traceback.format_exc()
         logs.append(_timestamped(f"ERROR: {exc}"))
-        logs.append(_timestamped(tb_str))
+        # RuntimeError is how the steps above report an expected git failure; its
+        # message says everything, so only format a traceback for real surprises.
+        if DEBUG_LOGS or type(exc) is not RuntimeError:
+            logs.append(_timestamped(traceback.format_exc()))
         _log_debug(logs, "Request failed with exception.")
         success = False
 
@@ -1062,73 +1359,141 @@ async def process_submission(form: Dict[str, str], logs: LogSink) -> Dict[str, o
 
 
 async def frontend_handler(request: web.Request) -> web.Response:
-    frontend_root = request.app["frontend_root"]
-    return web.FileResponse(frontend_root / "index.html")
+    etag = request.app["index_etag"]
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("If-None-Match", "")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return web.Response(status=304, headers=headers)
+    return web.Response(body=request.app["index_bytes"], content_type="text/html", charset="utf-8", headers=headers)
 
 
 async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
-    websocket = web.WebSocketResponse()
+    # permessage-deflate is on by default (compress=True) and the 4 MiB message
+    # cap is kept because submissions carry whole patches; the heartbeat drops
+    # dead clients instead of leaving them in app["websockets"].
+    websocket = web.WebSocketResponse(compress=True, heartbeat=WEBSOCKET_HEARTBEAT)
     await websocket.prepare(request)
-    sockets: set[web.WebSocketResponse] = request.app["websockets"]
-    sockets.add(websocket)
+    sockets: Dict[web.WebSocketResponse, None] = request.app["websockets"]
+    sockets[websocket] = None
+    log_sender = WebSocketLogSender(websocket)
     try:
         async for msg in websocket:
             if msg.type == web.WSMsgType.TEXT:
                 try:
-                    payload = json.loads(msg.data)
+                    payload = _json_loads(msg.data)
                 except json.JSONDecodeError:
-                    await websocket.send_json({"type": "error", "message": "Invalid JSON payload."})
+                    await websocket.send_json(
+                        {"type": "error", "message": "Invalid JSON payload."},
+                        dumps=_json_dumps,
+                    )
                     continue
                 if payload.get("type") == "submit":
                     form_data = payload.get("payload", {})
                     if not isinstance(form_data, dict):
-                        await websocket.send_json({"type": "error", "message": "Invalid form payload."})
+                        await websocket.send_json(
+                            {"type": "error", "message": "Invalid form payload."},
+                            dumps=_json_dumps,
+                        )
                         continue
-                    logs = LogSink(entries=[], websocket=websocket)
+                    logs = LogSink(sender=log_sender)
                     result = await process_submission(_normalize_form_payload(form_data), logs)
-                    await websocket.send_json({"type": "complete", "success": result["success"]})
-                elif payload.get("type") == "config":
+                    await logs.drain()
                     await websocket.send_json(
-                        {
-                            "type": "config",
-                            "request_id": payload.get("request_id"),
-                            "payload": _serialize_config(),
-                        }
+                        {"type": "complete", "success": result["success"]},
+                        dumps=_json_dumps,
+                    )
+                elif payload.get("type") == "config":
+                    request_id = _json_dumps(payload.get("request_id"))
+                    await websocket.send_str(
+                        f'{{"type": "config", "request_id": {request_id}, "payload": {_serialized_config_json()}}}'
                     )
                 elif payload.get("type") == "health":
+                    request_id = _json_dumps(payload.get("request_id"))
+                    await websocket.send_str(f'{{"type": "health", "request_id": {request_id}, "status": "ok"}}')
+                else:
                     await websocket.send_json(
-                        {
-                            "type": "health",
-                            "request_id": payload.get("request_id"),
-                            "status": "ok",
-                        }
+                        {"type": "error", "message": "Unknown websocket message type."},
+                        dumps=_json_dumps,
                     )
-                else:
-                    await websocket.send_json({"type": "error", "message": "Unknown websocket message type."})
             if msg.type == web.WSMsgType.ERROR:
                 break
     finally:
-        sockets.discard(websocket)
+        await log_sender.close()
+        sockets.pop(websocket, None)
     return websocket
 
 
+def _socket_chunks(app: web.Application):
+    sockets: Dict[web.WebSocketResponse, None] = app["websockets"]
+    snapshot = list(sockets)
+    for start in range(0, len(snapshot), BROADCAST_CHUNK_SIZE):
+        yield snapshot[start : start + BROADCAST_CHUNK_SIZE]
+
+
+async def broadcast_to_sockets(app: web.Application, payload: Dict[str, object]) -> None:
+    """Send one JSON payload to every connected websocket.
+
+    The payload is serialized once and shared by all clients; the loop yields
+    between chunks so a large fan-out does not starve other handlers.
+    """
+    data = _json_dumps(payload)
+    for index, chunk in enumerate(_socket_chunks(app)):
+        if index:
+            await asyncio.sleep(0)
+        for socket in chunk:
+            if socket.closed:
+                continue
+            try:
+                await socket.send_str(data)
+            except ConnectionError:
+                continue
+
+
 async def close_websockets(app: web.Application) -> None:
-    sockets: set[web.WebSocketResponse] = app["websockets"]
-    if not sockets:
+    for index, chunk in enumerate(_socket_chunks(app)):
+        if index:
+            await asyncio.sleep(0)
+        await asyncio.gather(*(socket.close() for socket in chunk))
+
+
+async def install_child_watcher(app: web.Application) -> None:
+    # Python 3.11 reaps every git child with a dedicated ThreadedChildWatcher
+    # thread; pidfds let the event loop wait on them directly (the 3.12+ default).
+    if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
         return
-    await asyncio.gather(*(socket.close() for socket in list(sockets)))
+    if type(asyncio.get_event_loop_policy()) is not asyncio.DefaultEventLoopPolicy:
+        # uvloop (or another custom loop) reaps children itself.
+        return
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(asyncio.get_running_loop())
+    asyncio.set_child_watcher(watcher)
 
 
 def create_app(serve_frontend: bool = True) -> web.Application:
     app = web.Application()
-    app["websockets"] = set()
+    # Insertion-ordered dict used as an ordered set: O(1) add/remove like a
+    # set, and broadcasts reach clients in the order they connected.
+    app["websockets"] = {}
+    app.on_startup.append(install_child_watcher)
     app.on_shutdown.append(close_websockets)
+    app.on_cleanup.append(clear_workspace_pool)
     app.router.add_route("GET", WS_PATH, websocket_handler)
     if serve_frontend:
         frontend_root = _frontend_root()
         if not frontend_root.exists():
             raise RuntimeError(f"Frontend root not found at {frontend_root}")
         app["frontend_root"] = frontend_root
+        # The SPA entry point is small and static: keep it in memory instead of
+        # stat + open + sendfile on every navigation.
+        index_bytes = (frontend_root / "index.html").read_bytes()
+        app["index_bytes"] = index_bytes
+        app["index_etag"] = f'"{hashlib.sha256(index_bytes).hexdigest()[:16]}"'
         app.router.add_route("GET", "/", frontend_handler)
         app.router.add_route("GET", "/index.html", frontend_handler)
     else:
@@ -1136,7 +1501,18 @@ def create_app(serve_frontend: bool = True) -> web.Application:
     return app
 
 
+def _install_uvloop() -> None:
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 if __name__ == "__main__":
+    _install_uvloop()
     args = _parse_args()
     _configure_runtime(args.config, args.repo_root, args.keep_temp)
     bind, port = _resolve_server_bind(bind_override=args.bind, port_override=args.port)